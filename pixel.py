@@ -5,6 +5,17 @@ import time
 import math
 import json
 import os
+import collections
+import logging
+import logging.handlers
+import queue
+import atexit
+import uuid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the performance renderer
+    np = None
 
 # Initialize pygame
 pygame.init()
@@ -51,12 +62,28 @@ small_font = pygame.font.SysFont('Arial', 16)
 # Clock for controlling the frame rate
 clock = pygame.time.Clock()
 
+# Surfaces reused every frame instead of being allocated by the draw functions
+overlay_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+overlay_surface.fill((0, 0, 0, 180))  # Semi-transparent black
+hud_surface = pygame.Surface((SCREEN_WIDTH, 50), pygame.SRCALPHA)
+hud_surface.fill((0, 0, 0, 150))  # Semi-transparent black
+grid_surface = None  # Built on first use by draw_grid
+
+# Rendered text, keyed by font, text and colour
+text_cache = {}
+TEXT_CACHE_SIZE = 256
+
 # Game states
 MENU = "menu"
 PLAYING = "playing"
 PAUSED = "paused"
 GAME_OVER = "game_over"
 TUTORIAL = "tutorial"
+SETTINGS = "settings"
+
+# Visual modes
+DETAILED = "detailed"
+PERFORMANCE = "performance"
 
 # Difficulty settings
 DIFFICULTIES = {
@@ -65,9 +92,35 @@ DIFFICULTIES = {
     "Hard": {"speed": 12, "power_up_chance": 0.008, "score_multiplier": 2.0}
 }
 
+# Visual effect levels, from cheapest to richest
+QUALITY_LEVELS = [
+    {"name": "Minimal", "particle_scale": 0.0, "star_count": 0, "twinkle": False, "highlights": False, "trail_length": 0, "pulse": False},
+    {"name": "Low", "particle_scale": 0.25, "star_count": 25, "twinkle": False, "highlights": False, "trail_length": 2, "pulse": False},
+    {"name": "Medium", "particle_scale": 0.5, "star_count": 50, "twinkle": True, "highlights": False, "trail_length": 3, "pulse": True},
+    {"name": "High", "particle_scale": 1.0, "star_count": 100, "twinkle": True, "highlights": True, "trail_length": 5, "pulse": True}
+]
+
+# Quality governor tuning
+TARGET_FPS = 60
+GOVERNOR_SMOOTHING = 0.1  # Weight of the newest frame in the average frame time
+GOVERNOR_SETTLE_FRAMES = 30  # Frames to wait after a change before lowering again
+GOVERNOR_RAISE_FRAMES = 180  # Consecutive frames under half the budget needed before raising the level
+
+# Star animation rates (FPS) while idle in menus, pause and game over; 0 keeps them still
+IDLE_ANIMATION_RATES = [0, 5, 10, 30]
+IDLE_ANIMATION_FPS = 10
+IDLE_WAIT_MS = 1000  # Longest single wait for input, so the loop still wakes up now and then
+
 # High score file
 HIGH_SCORE_FILE = "high_scores.json"
 
+# Gameplay telemetry log, rotated once it reaches the size limit
+TELEMETRY_FILE = "telemetry.jsonl"
+TELEMETRY_MAX_BYTES = 5 * 1024 * 1024
+TELEMETRY_BACKUP_COUNT = 5
+
+logger = logging.getLogger("snake")
+
 def load_high_scores():
     if os.path.exists(HIGH_SCORE_FILE):
         with open(HIGH_SCORE_FILE, 'r') as f:
@@ -78,6 +131,63 @@ def save_high_scores(scores):
     with open(HIGH_SCORE_FILE, 'w') as f:
         json.dump(scores, f)
 
+class Telemetry:
+    def __init__(self, path=TELEMETRY_FILE):
+        # Events are queued here and written to disk by a background thread
+        self.queue = queue.SimpleQueue()
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=TELEMETRY_MAX_BYTES, backupCount=TELEMETRY_BACKUP_COUNT,
+            encoding="utf-8", delay=True)
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        self.listener = logging.handlers.QueueListener(self.queue, file_handler)
+        self.logger = logging.getLogger("snake.telemetry")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(logging.handlers.QueueHandler(self.queue))
+        self.listener.start()
+        atexit.register(self.close)
+        self.game_id = None
+        self.start_ticks = 0
+    
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()  # Flushes whatever is still queued
+            self.listener = None
+    
+    def emit(self, event, **fields):
+        # Nothing is logged outside a game, e.g. for the rest of the frame the snake died in
+        if self.game_id is None:
+            return
+        # One compact JSON object per line
+        record = {"ev": event, "game": self.game_id, "ms": pygame.time.get_ticks() - self.start_ticks}
+        record.update(fields)
+        self.logger.info(json.dumps(record, separators=(",", ":")))
+    
+    def start_game(self, difficulty, speed):
+        # Random ids stay unique across quick restarts and game instances sharing a log
+        self.game_id = uuid.uuid4().hex
+        self.start_ticks = pygame.time.get_ticks()
+        self.emit("start", difficulty=difficulty, speed=speed)
+    
+    def end_game(self, event, snake, difficulty, **fields):
+        # event is "death" or "abandon"; either way the game is over
+        if self.game_id is None:
+            return
+        self.emit(event, difficulty=difficulty, tick=snake.ticks, length=snake.length,
+                  score=snake.score, effects=snake.get_active_power_ups(), **fields)
+        self.game_id = None
+
+def render_text(text_font, text, color):
+    # Scores and labels rarely change between frames, so reuse their surfaces
+    key = (text_font, text, color)
+    text_surface = text_cache.get(key)
+    if text_surface is None:
+        if len(text_cache) >= TEXT_CACHE_SIZE:
+            text_cache.clear()
+        text_surface = text_font.render(text, True, color)
+        text_cache[key] = text_surface
+    return text_surface
+
 # Sound functionality has been completely removed
 
 class Particle:
@@ -103,13 +213,20 @@ class Particle:
 class ParticleSystem:
     def __init__(self):
         self.particles = []
+        self.particle_scale = 1.0  # Lowered by the quality governor
     
     def add_particles(self, x, y, color, count=10):
-        for _ in range(count):
+        for _ in range(int(count * self.particle_scale)):
             self.particles.append(Particle(x, y, color))
     
     def update(self):
-        self.particles = [p for p in self.particles if p.update()]
+        # Compact the live particles in place rather than building a new list
+        alive = 0
+        for p in self.particles:
+            if p.update():
+                self.particles[alive] = p
+                alive += 1
+        del self.particles[alive:]
     
     def draw(self, surface):
         for p in self.particles:
@@ -123,6 +240,7 @@ class PowerUp:
         self.type = None
         self.spawn_time = 0
         self.duration = 10000  # 10 seconds in milliseconds
+        self.update_layout()
     
     def activate(self):
         self.active = True
@@ -132,42 +250,52 @@ class PowerUp:
     
     def randomize_position(self):
         self.position = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
+        self.update_layout()
+    
+    def update_layout(self):
+        # Shapes only change when the power-up moves, so build them here rather than in draw()
+        x = self.position[0] * GRID_SIZE
+        y = self.position[1] * GRID_SIZE
+        self.rect = pygame.Rect((x, y), (GRID_SIZE, GRID_SIZE))
+        self.diamond = [
+            (x + GRID_SIZE//2, y + 2),
+            (x + GRID_SIZE - 2, y + GRID_SIZE//2),
+            (x + GRID_SIZE//2, y + GRID_SIZE - 2),
+            (x + 2, y + GRID_SIZE//2)
+        ]
+        self.inner_rect = pygame.Rect((x + 5, y + 5), (GRID_SIZE - 10, GRID_SIZE - 10))
+        self.center = (x + GRID_SIZE//2, y + GRID_SIZE//2)
+        self.text_position = (x + 5, y + 5)
     
     def is_expired(self):
         return pygame.time.get_ticks() - self.spawn_time > self.duration
     
-    def draw(self, surface):
+    def is_visible(self):
         if not self.active:
-            return
-            
+            return False
         # Flash the power-up when it's about to expire
         remaining = self.duration - (pygame.time.get_ticks() - self.spawn_time)
-        if remaining < 3000 and (remaining // 200) % 2 == 0:
+        return not (remaining < 3000 and (remaining // 200) % 2 == 0)
+    
+    def draw(self, surface):
+        if not self.is_visible():
             return
             
-        rect = pygame.Rect((self.position[0] * GRID_SIZE, self.position[1] * GRID_SIZE), (GRID_SIZE, GRID_SIZE))
-        
         # Draw different power-ups with different appearances
         if self.type == 'speed':
-            pygame.draw.rect(surface, BLUE, rect)
-            pygame.draw.polygon(surface, WHITE, [
-                (self.position[0] * GRID_SIZE + GRID_SIZE//2, self.position[1] * GRID_SIZE + 2),
-                (self.position[0] * GRID_SIZE + GRID_SIZE - 2, self.position[1] * GRID_SIZE + GRID_SIZE//2),
-                (self.position[0] * GRID_SIZE + GRID_SIZE//2, self.position[1] * GRID_SIZE + GRID_SIZE - 2),
-                (self.position[0] * GRID_SIZE + 2, self.position[1] * GRID_SIZE + GRID_SIZE//2)
-            ])
+            pygame.draw.rect(surface, BLUE, self.rect)
+            pygame.draw.polygon(surface, WHITE, self.diamond)
         elif self.type == 'slow':
-            pygame.draw.rect(surface, PURPLE, rect)
-            smaller_rect = pygame.Rect((self.position[0] * GRID_SIZE + 5, self.position[1] * GRID_SIZE + 5), (GRID_SIZE - 10, GRID_SIZE - 10))
-            pygame.draw.rect(surface, WHITE, smaller_rect)
+            pygame.draw.rect(surface, PURPLE, self.rect)
+            pygame.draw.rect(surface, WHITE, self.inner_rect)
         elif self.type == 'invincible':
-            pygame.draw.rect(surface, GOLD, rect)
-            pygame.draw.circle(surface, WHITE, (self.position[0] * GRID_SIZE + GRID_SIZE//2, self.position[1] * GRID_SIZE + GRID_SIZE//2), GRID_SIZE//3)
+            pygame.draw.rect(surface, GOLD, self.rect)
+            pygame.draw.circle(surface, WHITE, self.center, GRID_SIZE//3)
         elif self.type == 'double_points':
-            pygame.draw.rect(surface, (255, 105, 180), rect)  # Hot pink
+            pygame.draw.rect(surface, (255, 105, 180), self.rect)  # Hot pink
             # Draw a "x2" text
-            text = small_font.render("x2", True, WHITE)
-            surface.blit(text, (self.position[0] * GRID_SIZE + 5, self.position[1] * GRID_SIZE + 5))
+            text = render_text(small_font, "x2", WHITE)
+            surface.blit(text, self.text_position)
 
 class Snake:
     def __init__(self):
@@ -179,6 +307,8 @@ class Snake:
         self.head_color = DARK_GREEN
         self.next_direction = RIGHT
         self.is_alive = True
+        self.ticks = 0  # Moves made so far
+        self.death_position = None
         self.power_ups = {
             'speed': {'active': False, 'end_time': 0},
             'slow': {'active': False, 'end_time': 0},
@@ -187,8 +317,18 @@ class Snake:
         }
         self.trail = []
         self.trail_length = 5
+        self.highlights = True  # 3D highlight on body segments
+        self.pulse_effect = True  # Pulsating colour while invincible
         self.movement_effect = 0  # For smooth movement animation
         self.movement_speed = 0.2  # Speed of movement animation
+        # Rects and colours reused by draw() instead of being rebuilt per segment
+        self.segment_rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+        self.highlight_rect = pygame.Rect(0, 0, GRID_SIZE - 4, GRID_SIZE - 4)
+        self.eye_rects = (pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        self.pupil_rects = (pygame.Rect(0, 0, 0, 0), pygame.Rect(0, 0, 0, 0))
+        self.trail_color = pygame.Color(0, 0, 0)
+        self.body_color = pygame.Color(0, 0, 0)
+        self.highlight_color = pygame.Color(0, 0, 0)
     
     def get_head_position(self):
         return self.positions[0]
@@ -200,37 +340,52 @@ class Snake:
         self.next_direction = direction
     
     def apply_power_up(self, power_up_type):
+        # Returns the power-ups this one cancelled
         duration = 5000  # 5 seconds
         current_time = pygame.time.get_ticks()
+        cancelled = ()
         
         # Deactivate conflicting power-ups
         if power_up_type == 'speed' and self.power_ups['slow']['active']:
             self.power_ups['slow']['active'] = False
+            cancelled = ('slow',)
         elif power_up_type == 'slow' and self.power_ups['speed']['active']:
             self.power_ups['speed']['active'] = False
+            cancelled = ('speed',)
             
         self.power_ups[power_up_type]['active'] = True
         self.power_ups[power_up_type]['end_time'] = current_time + duration
+        return cancelled
+    
+    def get_active_power_ups(self):
+        return [power_up_type for power_up_type, status in self.power_ups.items() if status['active']]
     
     def update_power_ups(self):
+        # Returns the power-ups that ran out on this call
         current_time = pygame.time.get_ticks()
+        expired = ()
         for power_up_type, status in self.power_ups.items():
             if status['active'] and current_time > status['end_time']:
                 status['active'] = False
+                expired += (power_up_type,)
+        return expired
     
     def move(self):
         if not self.is_alive:
             return
         
+        self.ticks += 1
         self.direction = self.next_direction
         head = self.get_head_position()
         new_x = (head[0] + self.direction[0]) % GRID_WIDTH
         new_y = (head[1] + self.direction[1]) % GRID_HEIGHT
         new_head = (new_x, new_y)
         
-        # Check if the snake hit itself (unless invincible)
-        if new_head in self.positions[1:] and not self.power_ups['invincible']['active']:
+        # Check if the snake hit itself (unless invincible). The new head is always
+        # one cell away from the current head, so there is no need to slice it off.
+        if new_head in self.positions and not self.power_ups['invincible']['active']:
             self.is_alive = False
+            self.death_position = new_head
             return
         
         self.positions.insert(0, new_head)
@@ -239,7 +394,7 @@ class Snake:
         if len(self.positions) > self.length:
             tail = self.positions.pop()
             self.trail.append((tail[0] * GRID_SIZE + GRID_SIZE//2, tail[1] * GRID_SIZE + GRID_SIZE//2))
-            if len(self.trail) > self.trail_length:
+            while len(self.trail) > self.trail_length:
                 self.trail.pop(0)
         
         # Update movement effect
@@ -250,38 +405,48 @@ class Snake:
         points_multiplier = 2 if self.power_ups['double_points']['active'] else 1
         self.score += points * points_multiplier
     
+    def get_head_color(self):
+        if self.power_ups['invincible']['active']:
+            return GOLD
+        elif self.power_ups['speed']['active']:
+            return BLUE
+        elif self.power_ups['slow']['active']:
+            return PURPLE
+        return DARK_GREEN
+    
+    def get_segment_color(self):
+        if not self.power_ups['invincible']['active']:
+            return self.color
+        if not self.pulse_effect:
+            return GOLD
+        # Pulsating gold effect for invincibility
+        pulse = (math.sin(pygame.time.get_ticks() / 100) + 1) / 2
+        return (
+            int(self.color[0] * (1-pulse) + GOLD[0] * pulse),
+            int(self.color[1] * (1-pulse) + GOLD[1] * pulse),
+            int(self.color[2] * (1-pulse) + GOLD[2] * pulse)
+        )
+    
     def draw(self, surface):
         # Draw trail first so it appears behind the snake
         for i, pos in enumerate(self.trail):
             alpha = int(255 * (i / len(self.trail)))  # Fade out older trail particles
-            color = (0, alpha, 0)  # Green with varying alpha
+            self.trail_color.g = alpha  # Green with varying alpha
             size = int(GRID_SIZE * 0.7 * (i / len(self.trail)))
-            pygame.draw.circle(surface, color, pos, size)
+            pygame.draw.circle(surface, self.trail_color, pos, size)
+        
+        # Apply visual effects for power-ups
+        segment_color = self.get_segment_color()
+        rect = self.segment_rect
         
         # Draw snake segments
         for i, p in enumerate(self.positions):
-            rect = pygame.Rect((p[0] * GRID_SIZE, p[1] * GRID_SIZE), (GRID_SIZE, GRID_SIZE))
-            
-            # Apply visual effects for power-ups
-            segment_color = self.color
-            if self.power_ups['invincible']['active']:
-                # Pulsating gold effect for invincibility
-                pulse = (math.sin(pygame.time.get_ticks() / 100) + 1) / 2
-                segment_color = (
-                    int(self.color[0] * (1-pulse) + GOLD[0] * pulse),
-                    int(self.color[1] * (1-pulse) + GOLD[1] * pulse),
-                    int(self.color[2] * (1-pulse) + GOLD[2] * pulse)
-                )
+            rect.x = p[0] * GRID_SIZE
+            rect.y = p[1] * GRID_SIZE
             
             # Draw the head with a different color
             if i == 0:
-                head_color = DARK_GREEN
-                if self.power_ups['invincible']['active']:
-                    head_color = GOLD
-                elif self.power_ups['speed']['active']:
-                    head_color = BLUE
-                elif self.power_ups['slow']['active']:
-                    head_color = PURPLE
+                head_color = self.get_head_color()
                 
                 # Draw a slightly rounded rectangle for the head
                 pygame.draw.rect(surface, head_color, rect, border_radius=3)
@@ -290,20 +455,22 @@ class Snake:
                 eye_size = GRID_SIZE // 5
                 eye_offset_x = GRID_SIZE // 3
                 eye_offset_y = GRID_SIZE // 3
+                eye1 = self.eye_rects[0]
+                eye2 = self.eye_rects[1]
                 
                 # Adjust eye position based on direction
                 if self.direction == UP:
-                    eye1 = pygame.Rect(p[0] * GRID_SIZE + eye_offset_x, p[1] * GRID_SIZE + eye_offset_y, eye_size, eye_size)
-                    eye2 = pygame.Rect(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, p[1] * GRID_SIZE + eye_offset_y, eye_size, eye_size)
+                    eye1.update(p[0] * GRID_SIZE + eye_offset_x, p[1] * GRID_SIZE + eye_offset_y, eye_size, eye_size)
+                    eye2.update(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, p[1] * GRID_SIZE + eye_offset_y, eye_size, eye_size)
                 elif self.direction == DOWN:
-                    eye1 = pygame.Rect(p[0] * GRID_SIZE + eye_offset_x, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, eye_size, eye_size)
-                    eye2 = pygame.Rect(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, eye_size, eye_size)
+                    eye1.update(p[0] * GRID_SIZE + eye_offset_x, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, eye_size, eye_size)
+                    eye2.update(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, eye_size, eye_size)
                 elif self.direction == LEFT:
-                    eye1 = pygame.Rect(p[0] * GRID_SIZE + eye_offset_y, p[1] * GRID_SIZE + eye_offset_x, eye_size, eye_size)
-                    eye2 = pygame.Rect(p[0] * GRID_SIZE + eye_offset_y, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, eye_size, eye_size)
+                    eye1.update(p[0] * GRID_SIZE + eye_offset_y, p[1] * GRID_SIZE + eye_offset_x, eye_size, eye_size)
+                    eye2.update(p[0] * GRID_SIZE + eye_offset_y, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, eye_size, eye_size)
                 else:  # RIGHT
-                    eye1 = pygame.Rect(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, p[1] * GRID_SIZE + eye_offset_x, eye_size, eye_size)
-                    eye2 = pygame.Rect(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, eye_size, eye_size)
+                    eye1.update(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, p[1] * GRID_SIZE + eye_offset_x, eye_size, eye_size)
+                    eye2.update(p[0] * GRID_SIZE + GRID_SIZE - eye_offset_y - eye_size, p[1] * GRID_SIZE + GRID_SIZE - eye_offset_x - eye_size, eye_size, eye_size)
                 
                 pygame.draw.rect(surface, WHITE, eye1)
                 pygame.draw.rect(surface, WHITE, eye2)
@@ -325,8 +492,10 @@ class Snake:
                     pupil_offset_y = pupil_offset
                     pupil_offset_x = pupil_offset * 2
                 
-                pupil1 = pygame.Rect(eye1.x + pupil_offset_x, eye1.y + pupil_offset_y, pupil_size, pupil_size)
-                pupil2 = pygame.Rect(eye2.x + pupil_offset_x, eye2.y + pupil_offset_y, pupil_size, pupil_size)
+                pupil1 = self.pupil_rects[0]
+                pupil2 = self.pupil_rects[1]
+                pupil1.update(eye1.x + pupil_offset_x, eye1.y + pupil_offset_y, pupil_size, pupil_size)
+                pupil2.update(eye2.x + pupil_offset_x, eye2.y + pupil_offset_y, pupil_size, pupil_size)
                 
                 pygame.draw.rect(surface, BLACK, pupil1)
                 pygame.draw.rect(surface, BLACK, pupil2)
@@ -334,22 +503,25 @@ class Snake:
                 # Draw body segments
                 # Add a gradient effect based on segment position
                 gradient_factor = 1 - (i / self.length) * 0.5  # Gradually darker toward the tail
-                segment_color = (
-                    int(segment_color[0] * gradient_factor),
-                    int(segment_color[1] * gradient_factor),
-                    int(segment_color[2] * gradient_factor)
-                )
+                body_color = self.body_color
+                body_color.r = int(segment_color[0] * gradient_factor)
+                body_color.g = int(segment_color[1] * gradient_factor)
+                body_color.b = int(segment_color[2] * gradient_factor)
                 
                 # Draw a rounded rectangle for body segments
-                pygame.draw.rect(surface, segment_color, rect, border_radius=3)
+                pygame.draw.rect(surface, body_color, rect, border_radius=3)
+                
+                if not self.highlights:
+                    continue
                 
                 # Add a highlight to give a 3D effect
-                smaller_rect = pygame.Rect((p[0] * GRID_SIZE + 2, p[1] * GRID_SIZE + 2), (GRID_SIZE - 4, GRID_SIZE - 4))
-                highlight_color = (
-                    min(255, segment_color[0] + 30),
-                    min(255, segment_color[1] + 30),
-                    min(255, segment_color[2] + 30)
-                )
+                smaller_rect = self.highlight_rect
+                smaller_rect.x = p[0] * GRID_SIZE + 2
+                smaller_rect.y = p[1] * GRID_SIZE + 2
+                highlight_color = self.highlight_color
+                highlight_color.r = min(255, body_color.r + 30)
+                highlight_color.g = min(255, body_color.g + 30)
+                highlight_color.b = min(255, body_color.b + 30)
                 pygame.draw.rect(surface, highlight_color, smaller_rect, border_radius=2)
 
 class Food:
@@ -362,6 +534,21 @@ class Food:
     
     def randomize_position(self):
         self.position = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
+        self.update_layout()
+    
+    def update_layout(self):
+        # Shapes only change when the food moves, so build them here rather than in draw()
+        center_x = self.position[0] * GRID_SIZE + GRID_SIZE // 2
+        center_y = self.position[1] * GRID_SIZE + GRID_SIZE // 2
+        apple_radius = GRID_SIZE // 2 - 2
+        self.center = (center_x, center_y)
+        self.highlight_center = (center_x - 2, center_y - 2)
+        self.stem = pygame.Rect(center_x - 1, center_y - apple_radius - 2, 2, 4)
+        self.leaf_points = [
+            (center_x + 2, center_y - apple_radius),
+            (center_x + 5, center_y - apple_radius - 3),
+            (center_x + 2, center_y - apple_radius - 3)
+        ]
     
     def update(self):
         # Create a pulsating effect
@@ -375,54 +562,220 @@ class Food:
                 self.growing = True
     
     def draw(self, surface):
-        center_x = self.position[0] * GRID_SIZE + GRID_SIZE // 2
-        center_y = self.position[1] * GRID_SIZE + GRID_SIZE // 2
-        
         # Draw a pulsating glow around the food
         glow_radius = GRID_SIZE // 2 + self.pulse_size
-        pygame.draw.circle(surface, (255, 100, 100, 128), (center_x, center_y), glow_radius)
+        pygame.draw.circle(surface, (255, 100, 100, 128), self.center, glow_radius)
         
         # Draw the food as an apple shape
         apple_radius = GRID_SIZE // 2 - 2
-        pygame.draw.circle(surface, RED, (center_x, center_y), apple_radius)
+        pygame.draw.circle(surface, RED, self.center, apple_radius)
         
         # Draw a smaller circle inside to give a highlight
-        pygame.draw.circle(surface, (255, 50, 50), (center_x - 2, center_y - 2), apple_radius // 2)
+        pygame.draw.circle(surface, (255, 50, 50), self.highlight_center, apple_radius // 2)
         
         # Draw a stem
-        stem = pygame.Rect(center_x - 1, center_y - apple_radius - 2, 2, 4)
-        pygame.draw.rect(surface, (0, 100, 0), stem)
+        pygame.draw.rect(surface, (0, 100, 0), self.stem)
         
         # Draw a leaf
-        leaf_points = [
-            (center_x + 2, center_y - apple_radius),
-            (center_x + 5, center_y - apple_radius - 3),
-            (center_x + 2, center_y - apple_radius - 3)
-        ]
-        pygame.draw.polygon(surface, (0, 150, 0), leaf_points)
+        pygame.draw.polygon(surface, (0, 150, 0), self.leaf_points)
+
+class BoardRenderer:
+    # Palette indices stored in the cell buffer
+    EMPTY = 0
+    BODY = 1
+    HEAD = 2
+    FOOD = 3
+    POWER_UP_INDICES = {'speed': 4, 'slow': 5, 'invincible': 6, 'double_points': 7}
+    
+    def __init__(self):
+        # One palette index per grid cell, scaled up to the screen in a single pass
+        self.cells = np.zeros((GRID_WIDTH, GRID_HEIGHT), dtype=np.uint8)
+        # Number of snake segments on each cell (segments overlap while invincible)
+        self.occupancy = np.zeros((GRID_WIDTH, GRID_HEIGHT), dtype=np.int16)
+        palette = [BG_COLOR, GREEN, DARK_GREEN, RED, BLUE, PURPLE, GOLD, (255, 105, 180)]
+        self.board = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), depth=8)
+        self.board.set_palette(palette + [BLACK] * (256 - len(palette)))
+        self.scaled = pygame.transform.scale(self.board, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.scaled.set_palette(self.board.get_palette())
+        # Empty cells are see-through so the stars and grid still show
+        self.scaled.set_colorkey(self.EMPTY)
+        self.snake = None
+        self.segments = collections.deque()
+        self.food_cell = None
+        self.power_up_cell = None
+        self.power_up_index = self.EMPTY
+    
+    def _set_color(self, index, color):
+        self.board.set_palette_at(index, color)
+        self.scaled.set_palette_at(index, color)
+    
+    def _repaint(self, cell):
+        x, y = cell
+        if self.occupancy[x, y]:
+            index = self.HEAD if cell == self.segments[0] else self.BODY
+        elif cell == self.food_cell:
+            index = self.FOOD
+        elif cell == self.power_up_cell:
+            index = self.power_up_index
+        else:
+            index = self.EMPTY
+        self.cells[x, y] = index
+    
+    def _rebuild(self, snake):
+        self.snake = snake
+        self.cells.fill(self.EMPTY)
+        self.occupancy.fill(0)
+        self.segments = collections.deque(snake.positions)
+        for x, y in self.segments:
+            self.occupancy[x, y] += 1
+        self.food_cell = None
+        self.power_up_cell = None
+        self.power_up_index = self.EMPTY
+        for cell in set(self.segments):
+            self._repaint(cell)
+    
+    def _sync_snake(self, snake):
+        if snake is not self.snake:
+            self._rebuild(snake)
+            return
+        head = snake.positions[0]
+        if head != self.segments[0]:
+            if len(snake.positions) > 1 and snake.positions[1] == self.segments[0]:
+                # The snake moved one cell: paint the new head, demote the old one
+                old_head = self.segments[0]
+                self.segments.appendleft(head)
+                self.occupancy[head[0], head[1]] += 1
+                self._repaint(head)
+                self._repaint(old_head)
+            else:
+                self._rebuild(snake)
+                return
+        # Clear the cells the tail has moved off
+        while len(self.segments) > len(snake.positions):
+            tail = self.segments.pop()
+            self.occupancy[tail[0], tail[1]] -= 1
+            self._repaint(tail)
+    
+    def _sync_food(self, food):
+        if food.position != self.food_cell:
+            old_cell = self.food_cell
+            self.food_cell = food.position
+            if old_cell is not None:
+                self._repaint(old_cell)
+            self._repaint(self.food_cell)
+    
+    def _sync_power_up(self, power_up, show_power_up):
+        cell = power_up.position if show_power_up and power_up.is_visible() else None
+        index = self.POWER_UP_INDICES.get(power_up.type, self.EMPTY)
+        if cell != self.power_up_cell or index != self.power_up_index:
+            old_cell = self.power_up_cell
+            self.power_up_cell = cell
+            self.power_up_index = index
+            if old_cell is not None:
+                self._repaint(old_cell)
+            if cell is not None:
+                self._repaint(cell)
+    
+    def draw(self, surface, snake, food, power_up, show_power_up=True):
+        # Only the cells that changed since the last frame are touched here
+        self._sync_snake(snake)
+        self._sync_food(food)
+        self._sync_power_up(power_up, show_power_up)
+        
+        # Power-up colours are palette entries, so pulsing costs nothing per segment
+        self._set_color(self.HEAD, snake.get_head_color())
+        self._set_color(self.BODY, snake.get_segment_color())
+        
+        pygame.surfarray.blit_array(self.board, self.cells)
+        pygame.transform.scale(self.board, (SCREEN_WIDTH, SCREEN_HEIGHT), self.scaled)
+        surface.blit(self.scaled, (0, 0))
+
+def draw_field(surface, snake, food, power_up, board_renderer=None, show_power_up=True):
+    # Draw the food, power-up and snake, in bulk when a board renderer is given
+    if board_renderer is not None:
+        board_renderer.draw(surface, snake, food, power_up, show_power_up)
+        return
+    food.draw(surface)
+    if show_power_up and power_up.active:
+        power_up.draw(surface)
+    snake.draw(surface)
+
+class QualityGovernor:
+    def __init__(self, target_fps=TARGET_FPS):
+        self.budget = 1000 / target_fps  # Milliseconds of work allowed per frame
+        self.level = len(QUALITY_LEVELS) - 1
+        self.adaptive = True
+        self.average_frame_time = 0
+        self.frames_since_change = 0
+        self.headroom_frames = 0  # Consecutive frames under the raise threshold
+    
+    def get_quality(self):
+        return QUALITY_LEVELS[self.level]
+    
+    def set_level(self, level):
+        # A fixed level from the settings menu; None hands control back to the governor
+        self.adaptive = level is None
+        if level is not None:
+            self.change_level(level, "set in settings")
+    
+    def change_level(self, level, reason):
+        if level == self.level:
+            return
+        logger.info("Quality %s -> %s: %s (average frame %.1f ms, budget %.1f ms)",
+                    QUALITY_LEVELS[self.level]["name"], QUALITY_LEVELS[level]["name"],
+                    reason, self.average_frame_time, self.budget)
+        self.level = level
+        self.frames_since_change = 0
+        self.headroom_frames = 0
+    
+    def update(self, frame_time):
+        # frame_time is the work done in the last frame, excluding the tick delay
+        self.average_frame_time += (frame_time - self.average_frame_time) * GOVERNOR_SMOOTHING
+        self.frames_since_change += 1
+        if frame_time < self.budget * 0.5:
+            self.headroom_frames += 1
+        else:
+            self.headroom_frames = 0
+        if not self.adaptive or self.frames_since_change < GOVERNOR_SETTLE_FRAMES:
+            return
+        
+        if self.average_frame_time > self.budget * 0.9 and self.level > 0:
+            self.change_level(self.level - 1, "over budget")
+        elif self.headroom_frames >= GOVERNOR_RAISE_FRAMES and self.level < len(QUALITY_LEVELS) - 1:
+            self.change_level(self.level + 1, "headroom")
+
+def apply_quality(quality, snake, particle_system):
+    # Push the current effect levels onto the objects that draw them
+    particle_system.particle_scale = quality["particle_scale"]
+    snake.trail_length = quality["trail_length"]
+    snake.highlights = quality["highlights"]
+    snake.pulse_effect = quality["pulse"]
 
 def draw_grid(surface):
-    # Draw a nicer grid with a subtle gradient
-    for x in range(0, SCREEN_WIDTH, GRID_SIZE):
-        alpha = 40 + (x // GRID_SIZE % 2) * 10  # Alternate slightly darker lines
-        pygame.draw.line(surface, (*GRID_COLOR, alpha), (x, 0), (x, SCREEN_HEIGHT))
-    for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
-        alpha = 40 + (y // GRID_SIZE % 2) * 10
-        pygame.draw.line(surface, (*GRID_COLOR, alpha), (0, y), (SCREEN_WIDTH, y))
+    global grid_surface
+    if grid_surface is None:
+        # The grid never changes, so draw it once and blit it every frame
+        grid_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        grid_surface.set_colorkey(BLACK, pygame.RLEACCEL)
+        # Draw a nicer grid with a subtle gradient
+        for x in range(0, SCREEN_WIDTH, GRID_SIZE):
+            alpha = 40 + (x // GRID_SIZE % 2) * 10  # Alternate slightly darker lines
+            pygame.draw.line(grid_surface, (*GRID_COLOR, alpha), (x, 0), (x, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
+            alpha = 40 + (y // GRID_SIZE % 2) * 10
+            pygame.draw.line(grid_surface, (*GRID_COLOR, alpha), (0, y), (SCREEN_WIDTH, y))
+    surface.blit(grid_surface, (0, 0))
 
 def draw_hud(surface, snake, power_ups_active=None):
     # Draw a semi-transparent HUD at the top
-    hud_height = 50
-    hud_surface = pygame.Surface((SCREEN_WIDTH, hud_height), pygame.SRCALPHA)
-    hud_surface.fill((0, 0, 0, 150))  # Semi-transparent black
     surface.blit(hud_surface, (0, 0))
     
     # Show score
-    score_text = font.render(f'Score: {snake.score}', True, WHITE)
+    score_text = render_text(font, f'Score: {snake.score}', WHITE)
     surface.blit(score_text, (10, 10))
     
     # Show length
-    length_text = font.render(f'Length: {snake.length}', True, WHITE)
+    length_text = render_text(font, f'Length: {snake.length}', WHITE)
     surface.blit(length_text, (150, 10))
     
     # Show active power-ups
@@ -432,15 +785,13 @@ def draw_hud(surface, snake, power_ups_active=None):
             if status['active']:
                 remaining = (status['end_time'] - pygame.time.get_ticks()) // 1000
                 if remaining > 0:
-                    power_up_text = font.render(f'{power_up_type.capitalize()}: {remaining}s', True, GOLD)
+                    power_up_text = render_text(font, f'{power_up_type.capitalize()}: {remaining}s', GOLD)
                     surface.blit(power_up_text, (x_pos, 10))
                     x_pos += 200
 
 def game_over_screen(surface, snake):
-    # Create a semi-transparent overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))  # Semi-transparent black
-    surface.blit(overlay, (0, 0))
+    # Draw the semi-transparent overlay
+    surface.blit(overlay_surface, (0, 0))
     
     # Game Over text with a shadow effect
     game_over_text = large_font.render('GAME OVER', True, RED)
@@ -467,20 +818,18 @@ def game_over_screen(surface, snake):
     surface.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 80))
 
 def draw_menu(surface, high_scores):
-    # Create a semi-transparent overlay
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
+    # Draw the semi-transparent overlay
+    surface.blit(overlay_surface, (0, 0))
     
     # Title
     title = large_font.render('SNAKE GAME', True, GREEN)
     surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, SCREEN_HEIGHT // 4))
     
     # Menu options
-    options = ['Play', 'Tutorial', 'High Scores', 'Quit']
+    options = ['Play', 'Tutorial', 'High Scores', 'Settings', 'Quit']
     for i, option in enumerate(options):
         text = font.render(option, True, WHITE)
-        surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + i * 50))
+        surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50 + i * 40))
     
     # Show high scores
     scores_text = font.render('High Scores:', True, GOLD)
@@ -491,9 +840,7 @@ def draw_menu(surface, high_scores):
         surface.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT * 3 // 4 + 30 + i * 25))
 
 def draw_tutorial(surface):
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
+    surface.blit(overlay_surface, (0, 0))
     
     title = large_font.render('How to Play', True, GREEN)
     surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 50))
@@ -518,9 +865,7 @@ def draw_tutorial(surface):
         surface.blit(instruction, (SCREEN_WIDTH // 2 - instruction.get_width() // 2, 150 + i * 25))
 
 def draw_pause_menu(surface):
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
+    surface.blit(overlay_surface, (0, 0))
     
     title = large_font.render('PAUSED', True, WHITE)
     surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, SCREEN_HEIGHT // 3))
@@ -530,6 +875,27 @@ def draw_pause_menu(surface):
         text = font.render(option, True, WHITE)
         surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + i * 50))
 
+def get_settings_options(quality_governor, visual_mode, performance_available, idle_fps):
+    quality = QUALITY_LEVELS[quality_governor.level]["name"]
+    if quality_governor.adaptive:
+        quality = f'Auto ({quality})'
+    mode = visual_mode.capitalize() if performance_available else 'Detailed (needs NumPy)'
+    idle_animation = f'{idle_fps} FPS' if idle_fps else 'Off'
+    return [f'Quality: {quality}', f'Visual mode: {mode}', f'Idle animation: {idle_animation}', 'Back']
+
+def draw_settings(surface, options):
+    surface.blit(overlay_surface, (0, 0))
+    
+    title = large_font.render('SETTINGS', True, WHITE)
+    surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, SCREEN_HEIGHT // 3))
+    
+    for i, option in enumerate(options):
+        text = font.render(option, True, WHITE)
+        surface.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + i * 50))
+    
+    hint = small_font.render('Use LEFT/RIGHT to change, ESC to go back', True, GRAY)
+    surface.blit(hint, (SCREEN_WIDTH // 2 - hint.get_width() // 2, SCREEN_HEIGHT - 50))
+
 def main():
     # Load high scores
     high_scores = load_high_scores()
@@ -539,24 +905,48 @@ def main():
     difficulty = "Normal"
     selected_option = 0
     
-    # Initialize background stars
-    stars = [(random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT), random.random() * 1.5 + 0.5) 
+    # The performance renderer needs NumPy for its cell buffer
+    visual_mode = DETAILED
+    board_renderer = BoardRenderer() if np is not None else None
+    quality_governor = QualityGovernor()
+    telemetry = Telemetry()
+    idle_fps = IDLE_ANIMATION_FPS
+    
+    # Initialize background stars as (center, radius) so drawing them builds no tuples
+    stars = [((random.randint(0, SCREEN_WIDTH), random.randint(0, SCREEN_HEIGHT)), int(random.random() * 1.5 + 0.5))
              for _ in range(100)]
+    star_color = pygame.Color(0, 0, 0)
     
     while True:
+        # Outside of gameplay, sleep until input arrives or an animation needs a frame
+        idle = game_state != PLAYING and not (game_state == GAME_OVER and particle_system.particles)
+        if idle:
+            quality = quality_governor.get_quality()
+            animate = idle_fps and quality["twinkle"] and quality["star_count"]
+            event = pygame.event.wait(1000 // idle_fps if animate else IDLE_WAIT_MS)
+            events = pygame.event.get()
+            if event.type != pygame.NOEVENT:
+                events.insert(0, event)
+            elif not animate:
+                continue  # Nothing changed, so there is nothing to redraw
+        else:
+            events = pygame.event.get()
+        
         current_time = pygame.time.get_ticks()
         
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
+                if game_state in (PLAYING, PAUSED):
+                    telemetry.end_game("abandon", snake, difficulty, reason="quit")
                 pygame.quit()
                 sys.exit()
             
             if event.type == pygame.KEYDOWN:
                 if game_state == MENU:
                     if event.key == pygame.K_UP:
-                        selected_option = (selected_option - 1) % 4
+                        selected_option = (selected_option - 1) % 5
                     elif event.key == pygame.K_DOWN:
-                        selected_option = (selected_option + 1) % 4
+                        selected_option = (selected_option + 1) % 5
                     elif event.key == pygame.K_RETURN:
                         if selected_option == 0:
                             game_state = PLAYING
@@ -568,18 +958,43 @@ def main():
                             game_speed = base_game_speed
                             last_move_time = 0
                             power_up_chance = DIFFICULTIES[difficulty]["power_up_chance"]
+                            telemetry.start_game(difficulty, base_game_speed)
                         elif selected_option == 1:
                             game_state = TUTORIAL
                         elif selected_option == 2:
                             # Show high scores screen
                             pass
                         elif selected_option == 3:
+                            game_state = SETTINGS
+                            selected_option = 0
+                        elif selected_option == 4:
                             pygame.quit()
                             sys.exit()
                 
                 elif game_state == TUTORIAL:
                     game_state = MENU
                 
+                elif game_state == SETTINGS:
+                    if event.key == pygame.K_UP:
+                        selected_option = (selected_option - 1) % 4
+                    elif event.key == pygame.K_DOWN:
+                        selected_option = (selected_option + 1) % 4
+                    elif event.key == pygame.K_ESCAPE or (event.key == pygame.K_RETURN and selected_option == 3):
+                        game_state = MENU
+                        selected_option = 3
+                    elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_RETURN):
+                        step = -1 if event.key == pygame.K_LEFT else 1
+                        if selected_option == 0:
+                            # Cycle through Auto followed by each fixed level
+                            choice = 0 if quality_governor.adaptive else quality_governor.level + 1
+                            choice = (choice + step) % (len(QUALITY_LEVELS) + 1)
+                            quality_governor.set_level(None if choice == 0 else choice - 1)
+                        elif selected_option == 1 and board_renderer is not None:
+                            visual_mode = PERFORMANCE if visual_mode == DETAILED else DETAILED
+                        elif selected_option == 2:
+                            choice = IDLE_ANIMATION_RATES.index(idle_fps) + step
+                            idle_fps = IDLE_ANIMATION_RATES[choice % len(IDLE_ANIMATION_RATES)]
+                
                 elif game_state == PLAYING:
                     if event.key == pygame.K_ESCAPE:
                         game_state = PAUSED
@@ -602,6 +1017,7 @@ def main():
                         if selected_option == 0:
                             game_state = PLAYING
                         elif selected_option == 1:
+                            telemetry.end_game("abandon", snake, difficulty, reason="restart")
                             game_state = PLAYING
                             snake = Snake()
                             food = Food()
@@ -610,7 +1026,9 @@ def main():
                             game_speed = base_game_speed
                             last_move_time = 0
                             power_up_chance = DIFFICULTIES[difficulty]["power_up_chance"]
+                            telemetry.start_game(difficulty, base_game_speed)
                         elif selected_option == 2:
+                            telemetry.end_game("abandon", snake, difficulty, reason="menu")
                             game_state = MENU
                 
                 elif game_state == GAME_OVER:
@@ -623,17 +1041,24 @@ def main():
                         game_speed = base_game_speed
                         last_move_time = 0
                         power_up_chance = DIFFICULTIES[difficulty]["power_up_chance"]
+                        telemetry.start_game(difficulty, base_game_speed)
                     elif event.key == pygame.K_q:
                         game_state = MENU
         
+        field_renderer = board_renderer if visual_mode == PERFORMANCE else None
+        
         # Clear screen
         screen.fill(BG_COLOR)
         
-        # Draw background stars
-        for i, (x, y, size) in enumerate(stars):
-            brightness = 128 + int(127 * math.sin(current_time / 1000 + i))
-            color = (brightness, brightness, brightness)
-            pygame.draw.circle(screen, color, (int(x), int(y)), int(size))
+        quality = quality_governor.get_quality()
+        
+        # Draw background stars, thinned and frozen at lower quality levels
+        star_time = current_time / 1000 if quality["twinkle"] else 0
+        for i in range(quality["star_count"]):
+            center, radius = stars[i]
+            brightness = 128 + int(127 * math.sin(star_time + i))
+            star_color.r = star_color.g = star_color.b = brightness
+            pygame.draw.circle(screen, star_color, center, radius)
         
         # Draw grid
         draw_grid(screen)
@@ -641,7 +1066,14 @@ def main():
         if game_state == MENU:
             draw_menu(screen, high_scores)
             # Highlight selected option
-            options = ['Play', 'Tutorial', 'High Scores', 'Quit']
+            options = ['Play', 'Tutorial', 'High Scores', 'Settings', 'Quit']
+            text = font.render(options[selected_option], True, GREEN)
+            screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 50 + selected_option * 40))
+        
+        elif game_state == SETTINGS:
+            options = get_settings_options(quality_governor, visual_mode, board_renderer is not None, idle_fps)
+            draw_settings(screen, options)
+            # Highlight selected option
             text = font.render(options[selected_option], True, GREEN)
             screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + selected_option * 50))
         
@@ -649,8 +1081,11 @@ def main():
             draw_tutorial(screen)
         
         elif game_state == PLAYING:
+            apply_quality(quality, snake, particle_system)
+            
             # Update game logic
-            snake.update_power_ups()
+            for power_up_type in snake.update_power_ups():
+                telemetry.emit("effect_end", type=power_up_type, reason="expired")
             game_speed = adjust_speed(base_game_speed, snake)
             
             if current_time - last_move_time > 1000 / game_speed:
@@ -659,6 +1094,8 @@ def main():
                 
                 if not snake.is_alive:
                     game_state = GAME_OVER
+                    telemetry.end_game("death", snake, difficulty, cause="self_collision",
+                                       pos=snake.death_position)
                     # Update high score if applicable
                     if snake.score > high_scores[difficulty]:
                         high_scores[difficulty] = snake.score
@@ -669,6 +1106,8 @@ def main():
             
             if snake.get_head_position() == food.position:
                 snake.grow(points=10 * DIFFICULTIES[difficulty]["score_multiplier"])
+                telemetry.emit("food", tick=snake.ticks, length=snake.length, score=snake.score,
+                               effects=snake.get_active_power_ups())
                 food.randomize_position()
                 
                 food_x = food.position[0] * GRID_SIZE + GRID_SIZE // 2
@@ -680,10 +1119,14 @@ def main():
                 
                 if base_game_speed < 20:
                     base_game_speed += 0.2
+                    telemetry.emit("speed", tick=snake.ticks, speed=round(base_game_speed, 1))
             
             if power_up.active and snake.get_head_position() == power_up.position:
-                snake.apply_power_up(power_up.type)
+                cancelled = snake.apply_power_up(power_up.type)
                 power_up.active = False
+                for power_up_type in cancelled:
+                    telemetry.emit("effect_end", type=power_up_type, reason="cancelled")
+                telemetry.emit("powerup_pickup", type=power_up.type, tick=snake.ticks, length=snake.length)
                 
                 power_up_x = power_up.position[0] * GRID_SIZE + GRID_SIZE // 2
                 power_up_y = power_up.position[1] * GRID_SIZE + GRID_SIZE // 2
@@ -698,28 +1141,24 @@ def main():
             
             if power_up.active and power_up.is_expired():
                 power_up.active = False
+                telemetry.emit("powerup_expire", type=power_up.type, tick=snake.ticks)
             
             if not power_up.active and random.random() < power_up_chance and snake.length > 5:
                 power_up.activate()
                 while power_up.position in snake.positions or power_up.position == food.position:
                     power_up.randomize_position()
+                telemetry.emit("powerup_spawn", type=power_up.type, tick=snake.ticks, pos=power_up.position)
             
             particle_system.update()
             
             # Draw game elements
-            food.draw(screen)
-            if power_up.active:
-                power_up.draw(screen)
-            snake.draw(screen)
+            draw_field(screen, snake, food, power_up, field_renderer)
             particle_system.draw(screen)
             draw_hud(screen, snake, True)
         
         elif game_state == PAUSED:
             # Draw game elements in background
-            food.draw(screen)
-            if power_up.active:
-                power_up.draw(screen)
-            snake.draw(screen)
+            draw_field(screen, snake, food, power_up, field_renderer)
             particle_system.draw(screen)
             draw_hud(screen, snake, True)
             draw_pause_menu(screen)
@@ -729,15 +1168,19 @@ def main():
             screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + selected_option * 50))
         
         elif game_state == GAME_OVER:
-            food.draw(screen)
-            snake.draw(screen)
-            particle_system.draw(screen)
+            # The game-over screen shows only the food and the snake
+            draw_field(screen, snake, food, power_up, field_renderer, show_power_up=False)
             particle_system.update()
             particle_system.draw(screen)
             game_over_screen(screen, snake)
         
         pygame.display.update()
-        clock.tick(60)
+        clock.tick(TARGET_FPS)
+        
+        # Only gameplay frames are representative of the effect cost, and a frame
+        # that slept waiting for input would look far over budget
+        if game_state == PLAYING and not idle:
+            quality_governor.update(clock.get_rawtime())
 
 def adjust_speed(base_speed, snake):
     # Adjust the game speed based on active power-ups
@@ -749,4 +1192,5 @@ def adjust_speed(base_speed, snake):
         return base_speed
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
     main()
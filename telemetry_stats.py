@@ -0,0 +1,193 @@
+import argparse
+import collections
+import glob
+import gzip
+import json
+import sys
+
+# Matches the log written by the game (see TELEMETRY_FILE in pixel.py)
+DEFAULT_LOG = "telemetry.jsonl"
+
+# Games that never logged an end event are forgotten after this many newer games
+MAX_OPEN_GAMES = 10000
+
+def find_logs(path):
+    # Rotated backups are telemetry.jsonl.1 (newest) .. .N (oldest); read oldest first
+    def backup_number(name):
+        suffix = name[len(path) + 1:].split(".")[0]
+        return int(suffix) if suffix.isdigit() else 0
+    return sorted(glob.glob(glob.escape(path) + "*"), key=backup_number, reverse=True)
+
+def read_events(paths):
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # Skip lines cut off by a crash or rotation
+
+class DifficultyStats:
+    def __init__(self):
+        self.games = 0
+        self.deaths = 0
+        self.abandoned = 0
+        self.food = 0
+        self.speed_changes = 0
+        self.total_length = 0
+        self.total_score = 0
+        self.total_ticks = 0
+        self.total_ms = 0  # Game time of every ended game, for baseline rates
+        # Histograms of end tick, bucketed, for the survival curve
+        self.death_buckets = collections.Counter()
+        self.censored_buckets = collections.Counter()
+        self.spawns = collections.Counter()
+        self.pickups = collections.Counter()
+        self.expired = collections.Counter()
+        self.food_with_effect = collections.Counter()
+        self.deaths_with_effect = collections.Counter()
+        self.effect_ms = collections.Counter()  # Time spent under each effect
+    
+    def survival_curve(self, bucket_size):
+        # Kaplan-Meier estimate, treating abandoned games as censored
+        at_risk = self.deaths + self.abandoned
+        survival = 1.0
+        curve = []
+        last_bucket = max(list(self.death_buckets) + list(self.censored_buckets), default=-1)
+        for bucket in range(last_bucket + 1):
+            died = self.death_buckets[bucket]
+            if at_risk > 0 and died:
+                survival *= 1 - died / at_risk
+            curve.append(((bucket + 1) * bucket_size, round(survival, 4)))
+            at_risk -= died + self.censored_buckets[bucket]
+        return curve
+    
+    def summary(self, bucket_size):
+        ended = self.deaths + self.abandoned
+        minutes = self.total_ms / 60000
+        return {
+            "games": self.games,
+            "deaths": self.deaths,
+            "abandoned": self.abandoned,
+            "food_eaten": self.food,
+            "speed_changes": self.speed_changes,
+            "mean_ticks": round(self.total_ticks / ended, 1) if ended else 0,
+            "mean_length": round(self.total_length / ended, 1) if ended else 0,
+            "mean_score": round(self.total_score / ended, 1) if ended else 0,
+            "food_per_minute": round(self.food / minutes, 2) if minutes else 0,
+            "deaths_per_minute": round(self.deaths / minutes, 3) if minutes else 0,
+            "survival": self.survival_curve(bucket_size),
+            "power_ups": {
+                power_up_type: {
+                    "spawned": self.spawns[power_up_type],
+                    "picked_up": self.pickups[power_up_type],
+                    "expired": self.expired[power_up_type],
+                    "pickup_rate": round(self.pickups[power_up_type] / self.spawns[power_up_type], 3)
+                    if self.spawns[power_up_type] else 0,
+                    "active_seconds": round(self.effect_ms[power_up_type] / 1000, 1),
+                    "food_while_active": self.food_with_effect[power_up_type],
+                    "deaths_while_active": self.deaths_with_effect[power_up_type],
+                    "food_per_minute_active": round(self.food_with_effect[power_up_type] * 60000 / self.effect_ms[power_up_type], 2)
+                    if self.effect_ms[power_up_type] else 0,
+                    "deaths_per_minute_active": round(self.deaths_with_effect[power_up_type] * 60000 / self.effect_ms[power_up_type], 3)
+                    if self.effect_ms[power_up_type] else 0,
+                }
+                for power_up_type in sorted(set(self.spawns) | set(self.pickups))
+            },
+        }
+
+def aggregate(events, bucket_size):
+    stats = collections.defaultdict(DifficultyStats)
+    # Difficulty and effect start times (ms) of each game that has started but not ended yet
+    open_games = collections.OrderedDict()
+    for event in events:
+        kind = event.get("ev")
+        game = event.get("game")
+        if kind == "start":
+            open_games[game] = (event["difficulty"], {})
+            if len(open_games) > MAX_OPEN_GAMES:
+                open_games.popitem(last=False)
+            stats[event["difficulty"]].games += 1
+            continue
+        
+        difficulty, effect_starts = open_games.get(game, (event.get("difficulty"), {}))
+        if difficulty is None:
+            continue  # The start of this game was in a log we didn't read
+        entry = stats[difficulty]
+        
+        if kind == "food":
+            entry.food += 1
+            for power_up_type in event.get("effects", ()):
+                entry.food_with_effect[power_up_type] += 1
+        elif kind == "speed":
+            entry.speed_changes += 1
+        elif kind == "powerup_spawn":
+            entry.spawns[event["type"]] += 1
+        elif kind == "powerup_pickup":
+            entry.pickups[event["type"]] += 1
+            # Picking up an effect that is still running only extends it
+            effect_starts.setdefault(event["type"], event["ms"])
+        elif kind == "effect_end":
+            started = effect_starts.pop(event["type"], None)
+            if started is not None:
+                entry.effect_ms[event["type"]] += event["ms"] - started
+        elif kind == "powerup_expire":
+            entry.expired[event["type"]] += 1
+        elif kind in ("death", "abandon"):
+            open_games.pop(game, None)
+            # Effects still running when the game ended count up to the end
+            for power_up_type, started in effect_starts.items():
+                entry.effect_ms[power_up_type] += event["ms"] - started
+            entry.total_ms += event["ms"]
+            bucket = event["tick"] // bucket_size
+            if kind == "death":
+                entry.deaths += 1
+                entry.death_buckets[bucket] += 1
+                for power_up_type in event.get("effects", ()):
+                    entry.deaths_with_effect[power_up_type] += 1
+            else:
+                entry.abandoned += 1
+                entry.censored_buckets[bucket] += 1
+            entry.total_ticks += event["tick"]
+            entry.total_length += event["length"]
+            entry.total_score += event["score"]
+    return {difficulty: entry.summary(bucket_size) for difficulty, entry in sorted(stats.items())}
+
+def print_report(report, out=sys.stdout):
+    for difficulty, summary in report.items():
+        out.write(f"== {difficulty} ==\n")
+        out.write(f"Games: {summary['games']}  deaths: {summary['deaths']}  abandoned: {summary['abandoned']}\n")
+        out.write(f"Mean ticks: {summary['mean_ticks']}  length: {summary['mean_length']}  score: {summary['mean_score']}\n")
+        out.write(f"Food eaten: {summary['food_eaten']}  speed changes: {summary['speed_changes']}\n")
+        out.write(f"Per minute: food {summary['food_per_minute']}  deaths {summary['deaths_per_minute']}\n")
+        out.write("Survival (tick: fraction alive):\n")
+        for tick, survival in summary["survival"]:
+            out.write(f"  {tick:>6}: {survival:.3f}\n")
+        if summary["power_ups"]:
+            out.write("Power-ups (spawned / picked up / expired / pickup rate / active s / food per min active / deaths per min active):\n")
+            for power_up_type, impact in summary["power_ups"].items():
+                out.write(f"  {power_up_type:<14}{impact['spawned']:>8}{impact['picked_up']:>8}{impact['expired']:>8}"
+                          f"{impact['pickup_rate']:>8.3f}{impact['active_seconds']:>10}"
+                          f"{impact['food_per_minute_active']:>8}{impact['deaths_per_minute_active']:>8}\n")
+        out.write("\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate Snake gameplay telemetry into per-difficulty balance stats.")
+    parser.add_argument("logs", nargs="*", help=f"log files to read, oldest first (default: {DEFAULT_LOG} and its backups)")
+    parser.add_argument("--bucket", type=int, default=50, help="survival curve bucket size in ticks (default: 50)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    
+    paths = args.logs or find_logs(DEFAULT_LOG)
+    if not paths:
+        parser.error(f"no telemetry logs found at {DEFAULT_LOG}")
+    report = aggregate(read_events(paths), args.bucket)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import os
+import random
+import sys
+import tracemalloc
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pygame = pytest.importorskip("pygame")
+import pixel
+
+WARMUP_FRAMES = 50
+MEASURED_FRAMES = 200
+# Memory still held after the measured frames
+MAX_NET_BYTES_PER_FRAME = 256
+# Short-lived memory used inside one call: a list copy or rebuild goes well over this
+MAX_TRANSIENT_BYTES = 256
+
+RENDERERS = ["detailed"]
+if pixel.np is not None:
+    RENDERERS.append("performance")
+
+
+class Counter:
+    def __init__(self):
+        self.created = 0
+
+
+def counting_type(base, counter):
+    # Subclass that counts constructions made from Python, e.g. pygame.Rect(...) in pixel.py
+    class Counting(base):
+        def __init__(self, *args, **kwargs):
+            counter.created += 1
+            super().__init__(*args, **kwargs)
+    return Counting
+
+
+def make_game(length):
+    random.seed(length)
+    snake = pixel.Snake()
+    snake.length = length
+    # Invincible, so the snake keeps moving through itself without dying
+    snake.power_ups['invincible']['active'] = True
+    snake.power_ups['invincible']['end_time'] = 10 ** 9
+    for _ in range(length):
+        snake.move()
+    return snake, pixel.Food(), pixel.PowerUp(), pixel.ParticleSystem()
+
+
+def frame_steps(frame, snake, food, power_up, particle_system, board_renderer):
+    # Same update and draw calls as the PLAYING branch of main(), one step at a time
+    yield "move", snake.move
+    yield "food", food.update
+    if frame % 5 == 0:
+        # Keep plenty of particles alive so rebuilding their list would show up
+        yield "spawn", lambda: particle_system.add_particles(100, 100, pixel.GREEN, 15)
+    yield "particles", particle_system.update
+    yield "clear", lambda: pixel.screen.fill(pixel.BG_COLOR)
+    yield "grid", lambda: pixel.draw_grid(pixel.screen)
+    yield "field", lambda: pixel.draw_field(pixel.screen, snake, food, power_up, board_renderer)
+    yield "particles_draw", lambda: particle_system.draw(pixel.screen)
+    yield "hud", lambda: pixel.draw_hud(pixel.screen, snake, True)
+
+
+def play_frame(frame, *game):
+    for _, step in frame_steps(frame, *game):
+        step()
+
+
+def pixel_traces(snapshot):
+    return snapshot.filter_traces([tracemalloc.Filter(True, pixel.__file__)])
+
+
+@pytest.fixture(params=RENDERERS)
+def board_renderer(request):
+    return pixel.BoardRenderer() if request.param == "performance" else None
+
+
+@pytest.mark.parametrize("length", [10, 100, 400])
+def test_play_frame_net_allocations(length, board_renderer):
+    game = make_game(length) + (board_renderer,)
+    for frame in range(WARMUP_FRAMES):
+        play_frame(frame, *game)
+
+    tracemalloc.start()
+    try:
+        before = pixel_traces(tracemalloc.take_snapshot())
+        for frame in range(WARMUP_FRAMES, WARMUP_FRAMES + MEASURED_FRAMES):
+            play_frame(frame, *game)
+        after = pixel_traces(tracemalloc.take_snapshot())
+    finally:
+        tracemalloc.stop()
+
+    net_bytes = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    assert net_bytes / MEASURED_FRAMES < MAX_NET_BYTES_PER_FRAME
+
+
+@pytest.mark.parametrize("length", [10, 100, 400])
+def test_play_frame_transient_allocations(length, board_renderer):
+    game = make_game(length) + (board_renderer,)
+    for frame in range(WARMUP_FRAMES):
+        play_frame(frame, *game)
+
+    # Highest memory use above the starting point inside each step
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for frame in range(WARMUP_FRAMES, WARMUP_FRAMES + MEASURED_FRAMES):
+            for name, step in frame_steps(frame, *game):
+                start = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                step()
+                peaks[name] = max(peaks.get(name, 0), tracemalloc.get_traced_memory()[1] - start)
+    finally:
+        tracemalloc.stop()
+
+    assert peaks["move"] < MAX_TRANSIENT_BYTES
+    assert peaks["particles"] < MAX_TRANSIENT_BYTES
+
+
+@pytest.mark.parametrize("length", [10, 100, 400])
+def test_play_frame_creates_no_rects_or_surfaces(length, board_renderer, monkeypatch):
+    game = make_game(length) + (board_renderer,)
+    for frame in range(WARMUP_FRAMES):
+        play_frame(frame, *game)
+
+    counter = Counter()
+    monkeypatch.setattr(pygame, "Rect", counting_type(pygame.Rect, counter))
+    monkeypatch.setattr(pygame, "Surface", counting_type(pygame.Surface, counter))
+    for frame in range(WARMUP_FRAMES, WARMUP_FRAMES + MEASURED_FRAMES):
+        play_frame(frame, *game)
+
+    assert counter.created == 0
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pygame = pytest.importorskip("pygame")
+import pixel
+
+TOP_LEVEL = len(pixel.QUALITY_LEVELS) - 1
+
+
+def feed(governor, frame_time, frames):
+    for _ in range(frames):
+        governor.update(frame_time)
+
+
+def test_lowers_level_when_over_budget():
+    governor = pixel.QualityGovernor()
+    feed(governor, governor.budget * 2, pixel.GOVERNOR_SETTLE_FRAMES)
+    assert governor.level == TOP_LEVEL - 1
+
+
+def test_raises_level_after_sustained_headroom():
+    governor = pixel.QualityGovernor()
+    governor.change_level(0, "test")
+    feed(governor, governor.budget * 0.2, pixel.GOVERNOR_RAISE_FRAMES - 1)
+    assert governor.level == 0
+    governor.update(governor.budget * 0.2)
+    assert governor.level == 1
+
+
+def test_single_fast_frame_does_not_raise_level():
+    governor = pixel.QualityGovernor()
+    governor.change_level(0, "test")
+    # Just over the raise threshold; one idle frame pulls the average under it
+    feed(governor, governor.budget * 0.55, pixel.GOVERNOR_RAISE_FRAMES - 1)
+    governor.update(0)
+    assert governor.average_frame_time < governor.budget * 0.5
+    assert governor.level == 0
+
+
+def test_headroom_count_resets_on_a_slow_frame():
+    governor = pixel.QualityGovernor()
+    governor.change_level(0, "test")
+    feed(governor, governor.budget * 0.2, pixel.GOVERNOR_RAISE_FRAMES - 1)
+    governor.update(governor.budget * 0.7)
+    feed(governor, governor.budget * 0.2, pixel.GOVERNOR_RAISE_FRAMES - 1)
+    assert governor.level == 0
+
+
+def test_fixed_level_is_not_adjusted():
+    governor = pixel.QualityGovernor()
+    governor.set_level(1)
+    feed(governor, governor.budget * 2, pixel.GOVERNOR_RAISE_FRAMES)
+    assert governor.level == 1
@@ -0,0 +1,84 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telemetry_stats
+
+
+def start(game, ms=0, difficulty="Normal"):
+    return {"ev": "start", "game": game, "ms": ms, "difficulty": difficulty, "speed": 10}
+
+
+def end(kind, game, tick, ms, difficulty="Normal", effects=()):
+    return {"ev": kind, "game": game, "ms": ms, "difficulty": difficulty, "tick": tick,
+            "length": 5, "score": 20, "effects": list(effects)}
+
+
+EVENTS = [
+    start("a"),
+    start("b"),
+    {"ev": "powerup_spawn", "game": "a", "ms": 500, "type": "speed", "tick": 5, "pos": [1, 2]},
+    {"ev": "powerup_pickup", "game": "a", "ms": 1000, "type": "speed", "tick": 10, "length": 4},
+    {"ev": "food", "game": "a", "ms": 2000, "tick": 20, "length": 5, "score": 20, "effects": ["speed"]},
+    {"ev": "effect_end", "game": "a", "ms": 6000, "type": "speed"},
+    end("death", "a", tick=30, ms=10000),
+    # Abandoned in the same bucket as a's death, so it is censored after it
+    end("abandon", "b", tick=40, ms=8000),
+    start("c"),
+    end("death", "c", tick=120, ms=20000),
+    # The start of this game is missing, so its events can't be attributed
+    {"ev": "food", "game": "lost", "ms": 100, "tick": 1, "length": 4, "score": 10, "effects": []},
+    {"ev": "effect_end", "game": "lost", "ms": 200, "type": "slow"},
+]
+
+
+def test_aggregate_counts_games():
+    summary = telemetry_stats.aggregate(EVENTS, bucket_size=50)["Normal"]
+    assert summary["games"] == 3
+    assert summary["deaths"] == 2
+    assert summary["abandoned"] == 1
+    assert summary["food_eaten"] == 1
+    assert summary["mean_ticks"] == round((30 + 40 + 120) / 3, 1)
+
+
+def test_survival_curve_censors_abandoned_games():
+    summary = telemetry_stats.aggregate(EVENTS, bucket_size=50)["Normal"]
+    # Three at risk with one death in the first bucket, then one left for the death at tick 120
+    assert summary["survival"] == [(50, 0.6667), (100, 0.6667), (150, 0.0)]
+
+
+def test_power_up_rates_use_time_under_effect():
+    impact = telemetry_stats.aggregate(EVENTS, bucket_size=50)["Normal"]["power_ups"]["speed"]
+    assert impact["spawned"] == 1
+    assert impact["picked_up"] == 1
+    assert impact["active_seconds"] == 5.0
+    assert impact["food_per_minute_active"] == 12.0
+    assert impact["deaths_per_minute_active"] == 0
+
+
+def test_effect_running_at_game_end_counts_until_the_end():
+    events = [
+        start("a"),
+        {"ev": "powerup_pickup", "game": "a", "ms": 1000, "type": "invincible", "tick": 10, "length": 4},
+        end("death", "a", tick=30, ms=4000, effects=["invincible"]),
+    ]
+    impact = telemetry_stats.aggregate(events, bucket_size=50)["Normal"]["power_ups"]["invincible"]
+    assert impact["active_seconds"] == 3.0
+    assert impact["deaths_while_active"] == 1
+    assert impact["deaths_per_minute_active"] == 20.0
+
+
+def test_cancelled_effect_stops_counting_at_the_cancelling_pickup():
+    # Picking up speed cancels a running slow, which the game logs as an effect_end
+    events = [
+        start("a"),
+        {"ev": "powerup_pickup", "game": "a", "ms": 1000, "type": "slow", "tick": 10, "length": 4},
+        {"ev": "effect_end", "game": "a", "ms": 2000, "type": "slow", "reason": "cancelled"},
+        {"ev": "powerup_pickup", "game": "a", "ms": 2000, "type": "speed", "tick": 20, "length": 5},
+        end("death", "a", tick=600, ms=60000, effects=["speed"]),
+    ]
+    power_ups = telemetry_stats.aggregate(events, bucket_size=50)["Normal"]["power_ups"]
+    assert power_ups["slow"]["active_seconds"] == 1.0
+    assert power_ups["slow"]["deaths_while_active"] == 0
+    assert power_ups["speed"]["active_seconds"] == 58.0